@@ -52,28 +52,18 @@ class EstrategiaCrucesEMAs:
         # Calcular relación precio-VWAP
         df['precio_vs_vwap'] = (df['close'] - df['vwap']) / df['vwap'] * 100
         
-        # Detectar cruces de EMAs
-        df['cruce_alcista_emas'] = (
-            (df['ema_rapida'] > df['ema_lenta']) & 
-            (df['ema_rapida'].shift(1) <= df['ema_lenta'].shift(1))
-        )
-        
-        df['cruce_bajista_emas'] = (
-            (df['ema_rapida'] < df['ema_lenta']) & 
-            (df['ema_rapida'].shift(1) >= df['ema_lenta'].shift(1))
-        )
+        # Detectar cruces de EMAs por cambio de signo de la diferencia (sin shift)
+        signo_emas = np.sign(df['diferencia_emas'].to_numpy())
+        cambio_emas = np.diff(signo_emas, prepend=np.nan)
+        df['cruce_alcista_emas'] = (signo_emas > 0) & (cambio_emas > 0)
+        df['cruce_bajista_emas'] = (signo_emas < 0) & (cambio_emas < 0)
         
         # Detectar cruces de precio con VWAP
         df['precio_sobre_vwap'] = df['close'] > df['vwap']
-        df['cruce_alcista_vwap'] = (
-            (df['close'] > df['vwap']) & 
-            (df['close'].shift(1) <= df['vwap'].shift(1))
-        )
-        
-        df['cruce_bajista_vwap'] = (
-            (df['close'] < df['vwap']) & 
-            (df['close'].shift(1) >= df['vwap'].shift(1))
-        )
+        signo_vwap = np.sign((df['close'] - df['vwap']).to_numpy())
+        cambio_vwap = np.diff(signo_vwap, prepend=np.nan)
+        df['cruce_alcista_vwap'] = (signo_vwap > 0) & (cambio_vwap > 0)
+        df['cruce_bajista_vwap'] = (signo_vwap < 0) & (cambio_vwap < 0)
         
         # Señales combinadas EMAs + VWAP
         df['cruce_alcista'] = df['cruce_alcista_emas'] & df['precio_sobre_vwap']
@@ -105,15 +95,15 @@ class EstrategiaCrucesEMAs:
         cumulative_pv = 0
         cumulative_volume = 0
         
-        for i in range(len(df)):
-            pv = typical_price.iloc[i] * df['volume'].iloc[i]
+        for tp, volume in zip(typical_price.to_numpy(), df['volume'].to_numpy()):
+            pv = tp * volume
             cumulative_pv += pv
-            cumulative_volume += df['volume'].iloc[i]
+            cumulative_volume += volume
             
             if cumulative_volume > 0:
                 vwap = cumulative_pv / cumulative_volume
             else:
-                vwap = typical_price.iloc[i]
+                vwap = tp
             
             vwap_values.append(vwap)
         
@@ -124,37 +114,40 @@ class EstrategiaCrucesEMAs:
         Genera señales de compra/venta basadas en cruces de EMAs
         """
         señales = []
+        columnas = ['datetime', 'close', 'ema_rapida', 'ema_lenta', 'vwap', 'precio_vs_vwap',
+                    'rsi', 'macd', 'macd_signal', 'cruce_alcista', 'cruce_bajista']
         
-        for i in range(len(df)):
-            if df.iloc[i]['cruce_alcista']:
+        # itertuples evita construir una Series por fila
+        for fila in df[columnas].itertuples(index=False):
+            if fila.cruce_alcista:
                 # Señal de compra
                 señal = {
                     'tipo': 'COMPRA',
-                    'datetime': df.iloc[i]['datetime'],
-                    'precio': df.iloc[i]['close'],
-                    'ema_rapida': df.iloc[i]['ema_rapida'],
-                    'ema_lenta': df.iloc[i]['ema_lenta'],
-                    'vwap': df.iloc[i]['vwap'],
-                    'precio_vs_vwap': df.iloc[i]['precio_vs_vwap'],
-                    'rsi': df.iloc[i]['rsi'],
-                    'macd': df.iloc[i]['macd'],
-                    'confirmacion': self.confirmar_señal_compra(df.iloc[i])
+                    'datetime': fila.datetime,
+                    'precio': fila.close,
+                    'ema_rapida': fila.ema_rapida,
+                    'ema_lenta': fila.ema_lenta,
+                    'vwap': fila.vwap,
+                    'precio_vs_vwap': fila.precio_vs_vwap,
+                    'rsi': fila.rsi,
+                    'macd': fila.macd,
+                    'confirmacion': self.confirmar_señal_compra(fila)
                 }
                 señales.append(señal)
                 
-            elif df.iloc[i]['cruce_bajista']:
+            elif fila.cruce_bajista:
                 # Señal de venta
                 señal = {
                     'tipo': 'VENTA',
-                    'datetime': df.iloc[i]['datetime'],
-                    'precio': df.iloc[i]['close'],
-                    'ema_rapida': df.iloc[i]['ema_rapida'],
-                    'ema_lenta': df.iloc[i]['ema_lenta'],
-                    'vwap': df.iloc[i]['vwap'],
-                    'precio_vs_vwap': df.iloc[i]['precio_vs_vwap'],
-                    'rsi': df.iloc[i]['rsi'],
-                    'macd': df.iloc[i]['macd'],
-                    'confirmacion': self.confirmar_señal_venta(df.iloc[i])
+                    'datetime': fila.datetime,
+                    'precio': fila.close,
+                    'ema_rapida': fila.ema_rapida,
+                    'ema_lenta': fila.ema_lenta,
+                    'vwap': fila.vwap,
+                    'precio_vs_vwap': fila.precio_vs_vwap,
+                    'rsi': fila.rsi,
+                    'macd': fila.macd,
+                    'confirmacion': self.confirmar_señal_venta(fila)
                 }
                 señales.append(señal)
         
@@ -167,11 +160,11 @@ class EstrategiaCrucesEMAs:
         confirmaciones = []
         
         # RSI no debe estar en sobrecompra
-        if fila['rsi'] < 70:
+        if fila.rsi < 70:
             confirmaciones.append("RSI_OK")
         
         # MACD debe estar por encima de la línea de señal
-        if fila['macd'] > fila['macd_signal']:
+        if fila.macd > fila.macd_signal:
             confirmaciones.append("MACD_OK")
         
         return confirmaciones
@@ -183,11 +176,11 @@ class EstrategiaCrucesEMAs:
         confirmaciones = []
         
         # RSI no debe estar en sobreventa
-        if fila['rsi'] > 30:
+        if fila.rsi > 30:
             confirmaciones.append("RSI_OK")
         
         # MACD debe estar por debajo de la línea de señal
-        if fila['macd'] < fila['macd_signal']:
+        if fila.macd < fila.macd_signal:
             confirmaciones.append("MACD_OK")
         
         return confirmaciones
@@ -47,16 +47,11 @@ class EstrategiaCrucesEMAs:
         # Calcular diferencia entre EMAs
         df['diferencia_emas'] = df['ema_rapida'] - df['ema_lenta']
         
-        # Detectar cruces
-        df['cruce_alcista'] = (
-            (df['ema_rapida'] > df['ema_lenta']) & 
-            (df['ema_rapida'].shift(1) <= df['ema_lenta'].shift(1))
-        )
-        
-        df['cruce_bajista'] = (
-            (df['ema_rapida'] < df['ema_lenta']) & 
-            (df['ema_rapida'].shift(1) >= df['ema_lenta'].shift(1))
-        )
+        # Detectar cruces por cambio de signo de la diferencia (sin shift)
+        signo = np.sign(df['diferencia_emas'].to_numpy())
+        cambio = np.diff(signo, prepend=np.nan)
+        df['cruce_alcista'] = (signo > 0) & (cambio > 0)
+        df['cruce_bajista'] = (signo < 0) & (cambio < 0)
         
         # Determinar tendencia
         df['tendencia'] = np.where(
@@ -77,33 +72,36 @@ class EstrategiaCrucesEMAs:
         Genera señales de compra/venta basadas en cruces de EMAs
         """
         señales = []
+        columnas = ['datetime', 'close', 'ema_rapida', 'ema_lenta', 'rsi', 'macd',
+                    'macd_signal', 'cruce_alcista', 'cruce_bajista']
         
-        for i in range(len(df)):
-            if df.iloc[i]['cruce_alcista']:
+        # itertuples evita construir una Series por fila
+        for fila in df[columnas].itertuples(index=False):
+            if fila.cruce_alcista:
                 # Señal de compra
                 señal = {
                     'tipo': 'COMPRA',
-                    'datetime': df.iloc[i]['datetime'],
-                    'precio': df.iloc[i]['close'],
-                    'ema_rapida': df.iloc[i]['ema_rapida'],
-                    'ema_lenta': df.iloc[i]['ema_lenta'],
-                    'rsi': df.iloc[i]['rsi'],
-                    'macd': df.iloc[i]['macd'],
-                    'confirmacion': self.confirmar_señal_compra(df.iloc[i])
+                    'datetime': fila.datetime,
+                    'precio': fila.close,
+                    'ema_rapida': fila.ema_rapida,
+                    'ema_lenta': fila.ema_lenta,
+                    'rsi': fila.rsi,
+                    'macd': fila.macd,
+                    'confirmacion': self.confirmar_señal_compra(fila)
                 }
                 señales.append(señal)
                 
-            elif df.iloc[i]['cruce_bajista']:
+            elif fila.cruce_bajista:
                 # Señal de venta
                 señal = {
                     'tipo': 'VENTA',
-                    'datetime': df.iloc[i]['datetime'],
-                    'precio': df.iloc[i]['close'],
-                    'ema_rapida': df.iloc[i]['ema_rapida'],
-                    'ema_lenta': df.iloc[i]['ema_lenta'],
-                    'rsi': df.iloc[i]['rsi'],
-                    'macd': df.iloc[i]['macd'],
-                    'confirmacion': self.confirmar_señal_venta(df.iloc[i])
+                    'datetime': fila.datetime,
+                    'precio': fila.close,
+                    'ema_rapida': fila.ema_rapida,
+                    'ema_lenta': fila.ema_lenta,
+                    'rsi': fila.rsi,
+                    'macd': fila.macd,
+                    'confirmacion': self.confirmar_señal_venta(fila)
                 }
                 señales.append(señal)
         
@@ -116,11 +114,11 @@ class EstrategiaCrucesEMAs:
         confirmaciones = []
         
         # RSI no debe estar en sobrecompra
-        if fila['rsi'] < 70:
+        if fila.rsi < 70:
             confirmaciones.append("RSI_OK")
         
         # MACD debe estar por encima de la línea de señal
-        if fila['macd'] > fila['macd_signal']:
+        if fila.macd > fila.macd_signal:
             confirmaciones.append("MACD_OK")
         
         return confirmaciones
@@ -132,11 +130,11 @@ class EstrategiaCrucesEMAs:
         confirmaciones = []
         
         # RSI no debe estar en sobreventa
-        if fila['rsi'] > 30:
+        if fila.rsi > 30:
             confirmaciones.append("RSI_OK")
         
         # MACD debe estar por debajo de la línea de señal
-        if fila['macd'] < fila['macd_signal']:
+        if fila.macd < fila.macd_signal:
             confirmaciones.append("MACD_OK")
         
         return confirmaciones
@@ -2,11 +2,201 @@ import pandas as pd
 import numpy as np
 import talib
 import ccxt
+import ccxt.async_support as ccxt_async
+import asyncio
+import contextlib
+import os
 from datetime import datetime
 import time
+from _njit import njit
+
+@njit(cache=True, fastmath=True)
+def _vwap_loop(high, low, close, volume):
+    """
+    Calcula VWAP y la distancia porcentual del precio al VWAP en una sola pasada
+    """
+    n = close.shape[0]
+    vwap = np.empty(n, dtype=np.float64)
+    precio_vs_vwap = np.empty(n, dtype=np.float64)
+    cpv = 0.0
+    cv = 0.0
+    
+    for i in range(n):
+        tp = (high[i] + low[i] + close[i]) / 3.0
+        cpv += tp * volume[i]
+        cv += volume[i]
+        
+        # Si aún no hay volumen acumulado se usa el precio típico
+        if cv > 0:
+            v = cpv / cv
+        else:
+            v = tp
+        
+        vwap[i] = v
+        precio_vs_vwap[i] = (close[i] - v) / v * 100.0
+    
+    return vwap, precio_vs_vwap
+
+@njit(cache=True, fastmath=True)
+def _emas_y_cruces(close, periodo_rapido, periodo_lento):
+    """
+    Calcula EMA rápida, EMA lenta y sus cruces en una sola pasada sobre el cierre
+    
+    Replica el EMA de TA-Lib: se siembra con la media simple de los primeros
+    `periodo` cierres y antes de eso vale NaN. Los cruces solo se evalúan
+    cuando ambas EMAs existen en la vela actual y en la anterior.
+    """
+    n = close.shape[0]
+    ema_rapida = np.full(n, np.nan)
+    ema_lenta = np.full(n, np.nan)
+    cruce_alcista = np.zeros(n, dtype=np.bool_)
+    cruce_bajista = np.zeros(n, dtype=np.bool_)
+    
+    k_rapida = 2.0 / (periodo_rapido + 1)
+    k_lenta = 2.0 / (periodo_lento + 1)
+    valor_rapida = 0.0
+    valor_lenta = 0.0
+    diferencia_previa = 0.0
+    inicio = max(periodo_rapido, periodo_lento) - 1
+    
+    for i in range(n):
+        x = close[i]
+        
+        if i < periodo_rapido:
+            valor_rapida += x
+            if i == periodo_rapido - 1:
+                valor_rapida /= periodo_rapido
+        else:
+            valor_rapida = (x - valor_rapida) * k_rapida + valor_rapida
+        
+        if i < periodo_lento:
+            valor_lenta += x
+            if i == periodo_lento - 1:
+                valor_lenta /= periodo_lento
+        else:
+            valor_lenta = (x - valor_lenta) * k_lenta + valor_lenta
+        
+        if i >= periodo_rapido - 1:
+            ema_rapida[i] = valor_rapida
+        if i >= periodo_lento - 1:
+            ema_lenta[i] = valor_lenta
+        
+        if i >= inicio:
+            diferencia = valor_rapida - valor_lenta
+            if i > inicio:
+                cruce_alcista[i] = diferencia > 0 and diferencia_previa <= 0
+                cruce_bajista[i] = diferencia < 0 and diferencia_previa >= 0
+            diferencia_previa = diferencia
+    
+    return ema_rapida, ema_lenta, cruce_alcista, cruce_bajista
+
+def _cruces(diferencia):
+    """
+    Detecta cruces alcistas/bajistas a partir de la diferencia entre dos series
+    (rápida - lenta) con el cambio de signo entre velas, sin usar shift de
+    pandas. Los NaN nunca cuentan como cruce.
+    """
+    signo = np.sign(diferencia)
+    cambio = np.diff(signo, prepend=np.nan)
+    
+    cruce_alcista = (signo > 0) & (cambio > 0)
+    cruce_bajista = (signo < 0) & (cambio < 0)
+    return cruce_alcista, cruce_bajista
+
+def _paso_ema(estado, valor, periodo):
+    """
+    Avanza una EMA de TA-Lib con un valor nuevo en O(1)
+    
+    `estado` es (valores vistos, acumulado): la suma mientras se juntan los
+    primeros `periodo` valores (semilla SMA) y la EMA a partir de ahí.
+    Devuelve el nuevo estado y la EMA (NaN durante el arranque).
+    """
+    vistos, acumulado = estado
+    vistos += 1
+    
+    if vistos < periodo:
+        return (vistos, acumulado + valor), np.nan
+    if vistos == periodo:
+        acumulado = (acumulado + valor) / periodo
+    else:
+        acumulado = (valor - acumulado) * (2.0 / (periodo + 1)) + acumulado
+    return (vistos, acumulado), acumulado
+
+def _paso_rsi(estado, precio, periodo=14):
+    """
+    Avanza el RSI de Wilder de TA-Lib con un cierre nuevo en O(1)
+    
+    `estado` es (cierres vistos, cierre anterior, ganancia media, pérdida media);
+    las medias son sumas hasta juntar `periodo` diferencias.
+    """
+    vistos, previo, ganancia, perdida = estado
+    vistos += 1
+    
+    if vistos == 1:
+        return (vistos, precio, ganancia, perdida), np.nan
+    
+    cambio = precio - previo
+    if vistos > periodo + 1:
+        ganancia *= periodo - 1
+        perdida *= periodo - 1
+    if cambio < 0:
+        perdida -= cambio
+    else:
+        ganancia += cambio
+    if vistos < periodo + 1:
+        return (vistos, precio, ganancia, perdida), np.nan
+    ganancia /= periodo
+    perdida /= periodo
+    
+    # Igual que TA-Lib: un total por debajo de 1e-14 cuenta como cero y da RSI 0
+    total = ganancia + perdida
+    rsi = 0.0 if -1e-14 < total < 1e-14 else 100.0 * (ganancia / total)
+    return (vistos, precio, ganancia, perdida), rsi
+
+def dtype_señal(largo_symbol):
+    """
+    dtype estructurado de las señales, con el campo symbol de `largo_symbol` caracteres
+    
+    Una señal por fila; las confirmaciones se guardan como flags y se pasan a lista
+    al imprimir.
+    """
+    return np.dtype([
+        ('tipo', 'U6'),
+        ('symbol', f'U{max(largo_symbol, 1)}'),
+        ('datetime', 'datetime64[ns]'),
+        ('precio', 'f4'),
+        ('ema_rapida', 'f8'),
+        ('ema_lenta', 'f8'),
+        ('vwap', 'f8'),
+        ('precio_vs_vwap', 'f8'),
+        ('rsi', 'f8'),
+        ('macd', 'f8'),
+        ('rsi_ok', '?'),
+        ('macd_ok', '?')
+    ])
+
+def señal_a_dict(señal):
+    """
+    Convierte una señal del arreglo estructurado en diccionario (para mostrarla)
+    """
+    return {
+        'tipo': str(señal['tipo']),
+        'symbol': str(señal['symbol']),
+        'datetime': pd.Timestamp(señal['datetime']),
+        'precio': float(señal['precio']),
+        'ema_rapida': float(señal['ema_rapida']),
+        'ema_lenta': float(señal['ema_lenta']),
+        'vwap': float(señal['vwap']),
+        'precio_vs_vwap': float(señal['precio_vs_vwap']),
+        'rsi': float(señal['rsi']),
+        'macd': float(señal['macd']),
+        'confirmacion': [
+            nombre for nombre, ok in (("RSI_OK", señal['rsi_ok']), ("MACD_OK", señal['macd_ok'])) if ok
+        ]
+    }
 
 class EstrategiaCrucesEMAs:
-    def __init__(self, symbols, timeframe='1h', ema_rapida=12, ema_lenta=26):
+    def __init__(self, symbols, timeframe='1h', ema_rapida=12, ema_lenta=26, max_peticiones=8):
         """
         Estrategia de cruces de EMAs para múltiples criptomonedas usando TA-Lib
         
@@ -15,170 +205,349 @@ class EstrategiaCrucesEMAs:
             timeframe (str): Marco temporal ('1m', '5m', '15m', '1h', '4h', '1d')
             ema_rapida (int): Período de EMA rápida
             ema_lenta (int): Período de EMA lenta
+            max_peticiones (int): Máximo de peticiones simultáneas al exchange
         """
         self.symbols = symbols
         self.timeframe = timeframe
         self.ema_rapida = ema_rapida
         self.ema_lenta = ema_lenta
-        self.exchange = ccxt.binance()
+        self.exchange = ccxt.binance({'enableRateLimit': True})
+        self.max_peticiones = max_peticiones
+        self._exchange_async = None  # Cliente de ccxt.async_support, se crea al usarlo
+        self._mercados = None  # Mercados ya cargados, para no volver a descargarlos
+        self._cache = {}  # Últimas velas OHLCV descargadas por símbolo
+        self._estado_tick = {}  # (estado tras la última vela cerrada, cierre en curso) por símbolo
         
     def obtener_datos(self, symbol, limit=100):
         """
         Obtiene datos OHLCV del exchange para un símbolo específico
         """
         try:
-            ohlcv = self.exchange.fetch_ohlcv(symbol, self.timeframe, limit=limit)
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            df['datetime'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df['symbol'] = symbol  # Agregar columna con el símbolo
-            return df
+            parametros = self._parametros_fetch(symbol, limit)
+            ohlcv = self.exchange.fetch_ohlcv(symbol, self.timeframe, **parametros)
+            return self._procesar_ohlcv(symbol, ohlcv, limit, incremental='since' in parametros)
         except Exception as e:
             print(f"Error obteniendo datos para {symbol}: {e}")
             return None
     
-    def calcular_indicadores(self, df):
+    async def obtener_datos_async(self, exchange, symbol, limit=100, semaforo=None):
         """
-        Calcula EMAs, VWAP y detecta cruces usando TA-Lib
+        Versión asíncrona de obtener_datos sobre un exchange de ccxt.async_support
+        """
+        try:
+            parametros = self._parametros_fetch(symbol, limit)
+            # Limitar peticiones simultáneas para respetar el rateLimit del exchange
+            async with semaforo if semaforo is not None else contextlib.nullcontext():
+                ohlcv = await exchange.fetch_ohlcv(symbol, self.timeframe, **parametros)
+            return self._procesar_ohlcv(symbol, ohlcv, limit, incremental='since' in parametros)
+        except Exception as e:
+            print(f"Error obteniendo datos para {symbol}: {e}")
+            return None
+    
+    async def descargar_datos(self, limit=100):
         """
-        # Calcular EMAs con TA-Lib
-        df['ema_rapida'] = talib.EMA(df['close'].values, timeperiod=self.ema_rapida)
-        df['ema_lenta'] = talib.EMA(df['close'].values, timeperiod=self.ema_lenta)
+        Descarga los datos de todos los símbolos en paralelo con un solo event loop
+        """
+        exchange = self._cliente_async()
+        semaforo = asyncio.Semaphore(self.max_peticiones)
+        resultados = await asyncio.gather(*[
+            self.obtener_datos_async(exchange, symbol, limit, semaforo)
+            for symbol in self.symbols
+        ])
         
-        # Calcular VWAP manualmente
-        df['vwap'] = self.calcular_vwap(df)
+        return dict(zip(self.symbols, resultados))
+    
+    def _cliente_async(self):
+        """
+        Devuelve el cliente asíncrono del exchange, creándolo la primera vez
+        """
+        if self._exchange_async is None:
+            self._exchange_async = ccxt_async.binance({'enableRateLimit': True})
+            if self._mercados is not None:
+                # Reutilizar los mercados de un cliente anterior (evita load_markets)
+                self._exchange_async.set_markets(*self._mercados)
+        return self._exchange_async
+    
+    async def cerrar(self):
+        """
+        Cierra el cliente asíncrono del exchange conservando los mercados cargados
+        """
+        if self._exchange_async is not None:
+            if self._exchange_async.markets:
+                self._mercados = (self._exchange_async.markets, self._exchange_async.currencies)
+            await self._exchange_async.close()
+            self._exchange_async = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.cerrar()
+    
+    def _es_incremental(self, symbol, limit):
+        """
+        Indica si basta con pedir las velas nuevas del símbolo a partir de la caché
         
-        # Calcular diferencia entre EMAs
-        df['diferencia_emas'] = df['ema_rapida'] - df['ema_lenta']
+        Solo si la caché tiene al menos `limit` velas y la última no es más vieja que
+        `limit` velas: si no, la respuesta desde `since` (limitada por el exchange)
+        no llegaría hasta la vela actual.
+        """
+        cache = self._cache.get(symbol)
+        if cache is None or len(cache) < limit:
+            return False
         
-        # Calcular relación precio-VWAP
-        df['precio_vs_vwap'] = (df['close'] - df['vwap']) / df['vwap'] * 100
+        ms_por_vela = self.exchange.parse_timeframe(self.timeframe) * 1000
+        antiguedad = self.exchange.milliseconds() - int(cache['timestamp'].iloc[-1])
+        return antiguedad <= limit * ms_por_vela
+    
+    def _parametros_fetch(self, symbol, limit):
+        """
+        Parámetros de fetch_ohlcv: solo las velas nuevas si el símbolo está en caché
+        """
+        if self._es_incremental(symbol, limit):
+            # Pedir desde la última vela guardada (puede seguir abierta)
+            # Con `limit` explícito: el tamaño de página por defecto (500 en Binance)
+            # podría no cubrir el retraso permitido por _es_incremental
+            return {'since': int(self._cache[symbol]['timestamp'].iloc[-1]), 'limit': limit}
+        return {'limit': limit}
+    
+    def _procesar_ohlcv(self, symbol, ohlcv, limit, incremental=False):
+        """
+        Convierte la respuesta OHLCV en DataFrame, la une con la caché y la actualiza
+        """
+        columnas = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+        cache = self._cache.get(symbol) if incremental else None
         
-        # Detectar cruces de EMAs
-        df['cruce_alcista_emas'] = (
-            (df['ema_rapida'] > df['ema_lenta']) & 
-            (df['ema_rapida'].shift(1) <= df['ema_lenta'].shift(1))
+        # OHLCV en float32: la mitad de memoria; TA-Lib recibe una copia float64
+        df = pd.DataFrame(ohlcv, columns=columnas).astype(
+            {c: np.float32 for c in ('open', 'high', 'low', 'close', 'volume')}
         )
+        if cache is not None:
+            df = (
+                pd.concat([cache, df])
+                .drop_duplicates(subset='timestamp', keep='last')
+                .tail(limit)
+                .reset_index(drop=True)
+            )
+        self._cache[symbol] = df
         
-        df['cruce_bajista_emas'] = (
-            (df['ema_rapida'] < df['ema_lenta']) & 
-            (df['ema_rapida'].shift(1) >= df['ema_lenta'].shift(1))
-        )
+        # El estado de streaming se vuelve a sembrar desde la caché en el próximo tick
+        self._estado_tick.pop(symbol, None)
         
-        # Detectar cruces de precio con VWAP
-        df['precio_sobre_vwap'] = df['close'] > df['vwap']
-        df['cruce_alcista_vwap'] = (
-            (df['close'] > df['vwap']) & 
-            (df['close'].shift(1) <= df['vwap'].shift(1))
+        df = df.copy()
+        df['datetime'] = pd.to_datetime(df['timestamp'], unit='ms')
+        # Agregar columna con el símbolo como categoría (un solo string por DataFrame)
+        df['symbol'] = pd.Categorical.from_codes(np.zeros(len(df), dtype=np.int8), categories=[symbol])
+        return df
+    
+    def calcular_indicadores(self, df):
+        """
+        Calcula EMAs, VWAP y detecta cruces usando TA-Lib
+        """
+        # Extraer el cierre una sola vez como float64 contiguo (los OHLCV se guardan
+        # en float32) y reutilizarlo en TA-Lib y en los cruces
+        close = np.ascontiguousarray(df['close'].to_numpy(dtype=np.float64))
+        
+        # EMAs y sus cruces en una sola pasada (mismo resultado que talib.EMA)
+        ema_rapida, ema_lenta, cruce_alcista_emas, cruce_bajista_emas = _emas_y_cruces(
+            close, self.ema_rapida, self.ema_lenta
         )
+        rsi = talib.RSI(close, timeperiod=14)
+        macd, macd_signal, macd_hist = talib.MACD(close)
         
-        df['cruce_bajista_vwap'] = (
-            (df['close'] < df['vwap']) & 
-            (df['close'].shift(1) >= df['vwap'].shift(1))
+        # Calcular VWAP y relación precio-VWAP en una sola pasada
+        vwap, precio_vs_vwap = _vwap_loop(
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            close,
+            df['volume'].to_numpy(dtype=np.float64)
         )
         
-        # Señales combinadas EMAs + VWAP
-        df['cruce_alcista'] = df['cruce_alcista_emas'] & df['precio_sobre_vwap']
-        df['cruce_bajista'] = df['cruce_bajista_emas'] & ~df['precio_sobre_vwap']
+        # Calcular diferencia entre EMAs
+        diferencia_emas = ema_rapida - ema_lenta
         
-        # Determinar tendencia
-        df['tendencia'] = np.where(
-            (df['ema_rapida'] > df['ema_lenta']) & (df['close'] > df['vwap']), 'ALCISTA', 
-            np.where((df['ema_rapida'] < df['ema_lenta']) & (df['close'] < df['vwap']), 'BAJISTA', 'NEUTRAL')
-        )
+        # Detectar cruces de precio con VWAP
+        diferencia_vwap = close - vwap
+        precio_sobre_vwap = diferencia_vwap > 0
+        cruce_alcista_vwap, cruce_bajista_vwap = _cruces(diferencia_vwap)
         
-        # Calcular RSI para confirmación
-        df['rsi'] = talib.RSI(df['close'].values, timeperiod=14)
+        # Determinar tendencia: -1 bajista, 0 neutral, 1 alcista (NaN cuenta como neutral)
+        signo_emas = np.sign(np.nan_to_num(diferencia_emas)).astype(np.int8)
+        signo_vwap = np.sign(np.nan_to_num(diferencia_vwap)).astype(np.int8)
+        codigo_tendencia = np.where(signo_emas == signo_vwap, signo_emas, 0).astype(np.int8)
+        tendencia = pd.Categorical.from_codes(
+            codigo_tendencia + 1, categories=['BAJISTA', 'NEUTRAL', 'ALCISTA']
+        )
         
-        # Calcular MACD para confirmación adicional
-        df['macd'], df['macd_signal'], df['macd_hist'] = talib.MACD(df['close'].values)
+        # Agregar todas las columnas de una vez para evitar reconstruir bloques
+        cols = {
+            'ema_rapida': ema_rapida,
+            'ema_lenta': ema_lenta,
+            'vwap': vwap,
+            'diferencia_emas': diferencia_emas,
+            'precio_vs_vwap': precio_vs_vwap,
+            'cruce_alcista_emas': cruce_alcista_emas,
+            'cruce_bajista_emas': cruce_bajista_emas,
+            'precio_sobre_vwap': precio_sobre_vwap,
+            'cruce_alcista_vwap': cruce_alcista_vwap,
+            'cruce_bajista_vwap': cruce_bajista_vwap,
+            # Señales combinadas EMAs + VWAP
+            'cruce_alcista': cruce_alcista_emas & precio_sobre_vwap,
+            'cruce_bajista': cruce_bajista_emas & ~precio_sobre_vwap,
+            'tendencia': tendencia,
+            # RSI y MACD para confirmación
+            'rsi': rsi,
+            'macd': macd,
+            'macd_signal': macd_signal,
+            'macd_hist': macd_hist,
+            # Confirmaciones precalculadas para las señales
+            'macd_bull': macd > macd_signal,
+            'macd_bear': macd < macd_signal,
+            'rsi_buy_ok': rsi < 70,
+            'rsi_sell_ok': rsi > 30
+        }
         
-        return df
+        return df.assign(**cols)
     
-    def calcular_vwap(self, df):
+    def actualizar_tick(self, symbol, precio, nueva_vela=False):
         """
-        Calcula VWAP (Volume Weighted Average Price)
+        Actualiza los indicadores de un símbolo con un precio en tiempo real
+        
+        Guarda por símbolo el estado de las recursiones (EMAs, medias de Wilder
+        del RSI y EMAs del MACD) tras la última vela cerrada, así cada tick
+        cuesta O(1) sin importar cuánto histórico haya. Los valores coinciden
+        con calcular_indicadores sobre la misma serie de cierres (a diferencia
+        de talib.stream, que solo mira el período de lookback).
+        
+        El estado se siembra una vez con la caché de velas (la última vela
+        descargada se toma como la vela en curso); cada vez que
+        obtener_datos/descargar_datos refresca la caché del símbolo, el estado
+        se descarta y se vuelve a sembrar.
+        
+        Args:
+            symbol (str): Par de trading
+            precio (float): Último precio recibido (ej: desde el websocket)
+            nueva_vela (bool): True si el precio abre una vela nueva; si no,
+                reemplaza el cierre de la vela en curso
         """
-        typical_price = (df['high'] + df['low'] + df['close']) / 3
-        vwap_values = []
-        cumulative_pv = 0
-        cumulative_volume = 0
+        precio = float(precio)
+        if symbol not in self._estado_tick:
+            self._estado_tick[symbol] = self._sembrar_estado(symbol)
+        cerrado, en_curso = self._estado_tick[symbol]
         
-        for i in range(len(df)):
-            pv = typical_price.iloc[i] * df['volume'].iloc[i]
-            cumulative_pv += pv
-            cumulative_volume += df['volume'].iloc[i]
-            
-            if cumulative_volume > 0:
-                vwap = cumulative_pv / cumulative_volume
-            else:
-                vwap = typical_price.iloc[i]
-            
-            vwap_values.append(vwap)
+        # La vela en curso se cierra: su estado pasa a ser el de la última vela cerrada
+        if nueva_vela and en_curso is not None:
+            cerrado = self._avanzar_estado(cerrado, en_curso)
+        self._estado_tick[symbol] = (cerrado, precio)
+        
+        actual = self._avanzar_estado(cerrado, precio)
         
-        return pd.Series(vwap_values, index=df.index)
+        # Cruces respecto a la vela anterior (NaN nunca cuenta como cruce)
+        diferencia = actual['ema_rapida'] - actual['ema_lenta']
+        previa = cerrado['ema_rapida'] - cerrado['ema_lenta']
+        
+        return {
+            'symbol': symbol,
+            'precio': precio,
+            'ema_rapida': actual['ema_rapida'],
+            'ema_lenta': actual['ema_lenta'],
+            'rsi': actual['rsi'],
+            'macd': actual['macd'],
+            'macd_signal': actual['macd_signal'],
+            'macd_hist': actual['macd_hist'],
+            'cruce_alcista_emas': bool(diferencia > 0 and previa <= 0),
+            'cruce_bajista_emas': bool(diferencia < 0 and previa >= 0)
+        }
     
-    def generar_señales(self, df):
+    def _sembrar_estado(self, symbol):
         """
-        Genera señales de compra/venta basadas en cruces de EMAs
+        Estado inicial de actualizar_tick: recorre una sola vez los cierres en caché
         """
-        señales = []
-        
-        for i in range(len(df)):
-            if df.iloc[i]['cruce_alcista']:
-                señal = {
-                    'tipo': 'COMPRA',
-                    'symbol': df.iloc[i]['symbol'],
-                    'datetime': df.iloc[i]['datetime'],
-                    'precio': df.iloc[i]['close'],
-                    'ema_rapida': df.iloc[i]['ema_rapida'],
-                    'ema_lenta': df.iloc[i]['ema_lenta'],
-                    'vwap': df.iloc[i]['vwap'],
-                    'precio_vs_vwap': df.iloc[i]['precio_vs_vwap'],
-                    'rsi': df.iloc[i]['rsi'],
-                    'macd': df.iloc[i]['macd'],
-                    'confirmacion': self.confirmar_señal_compra(df.iloc[i])
-                }
-                señales.append(señal)
-                
-            elif df.iloc[i]['cruce_bajista']:
-                señal = {
-                    'tipo': 'VENTA',
-                    'symbol': df.iloc[i]['symbol'],
-                    'datetime': df.iloc[i]['datetime'],
-                    'precio': df.iloc[i]['close'],
-                    'ema_rapida': df.iloc[i]['ema_rapida'],
-                    'ema_lenta': df.iloc[i]['ema_lenta'],
-                    'vwap': df.iloc[i]['vwap'],
-                    'precio_vs_vwap': df.iloc[i]['precio_vs_vwap'],
-                    'rsi': df.iloc[i]['rsi'],
-                    'macd': df.iloc[i]['macd'],
-                    'confirmacion': self.confirmar_señal_venta(df.iloc[i])
-                }
-                señales.append(señal)
+        cerrado = self._avanzar_estado(None, None)
+        cache = self._cache.get(symbol)
+        if cache is None or cache.empty:
+            return cerrado, None
         
-        return señales
+        cierres = cache['close'].to_numpy(dtype=np.float64).tolist()
+        for cierre in cierres[:-1]:
+            cerrado = self._avanzar_estado(cerrado, cierre)
+        return cerrado, cierres[-1]
     
-    def confirmar_señal_compra(self, fila):
+    def _avanzar_estado(self, estado, precio):
         """
-        Confirma señal de compra con RSI y MACD
+        Estado de los indicadores tras sumar una vela con cierre `precio`
+        
+        No modifica `estado`, así la vela en curso se puede recalcular en cada
+        tick. Con estado None devuelve el estado vacío (sin velas).
         """
-        confirmaciones = []
-        if fila['rsi'] < 70:
-            confirmaciones.append("RSI_OK")
-        if fila['macd'] > fila['macd_signal']:
-            confirmaciones.append("MACD_OK")
-        return confirmaciones
+        if estado is None:
+            return {
+                'velas': 0,
+                'recursion_ema_rapida': (0, 0.0),
+                'recursion_ema_lenta': (0, 0.0),
+                'recursion_rsi': (0, np.nan, 0.0, 0.0),
+                'recursion_macd_rapida': (0, 0.0),
+                'recursion_macd_lenta': (0, 0.0),
+                'recursion_macd_signal': (0, 0.0),
+                'ema_rapida': np.nan,
+                'ema_lenta': np.nan,
+                'rsi': np.nan,
+                'macd': np.nan,
+                'macd_signal': np.nan,
+                'macd_hist': np.nan
+            }
+        
+        nuevo = dict(estado, velas=estado['velas'] + 1)
+        nuevo['recursion_ema_rapida'], nuevo['ema_rapida'] = _paso_ema(
+            estado['recursion_ema_rapida'], precio, self.ema_rapida
+        )
+        nuevo['recursion_ema_lenta'], nuevo['ema_lenta'] = _paso_ema(
+            estado['recursion_ema_lenta'], precio, self.ema_lenta
+        )
+        nuevo['recursion_rsi'], nuevo['rsi'] = _paso_rsi(estado['recursion_rsi'], precio, 14)
+        
+        # MACD de TA-Lib (12/26/9): la EMA rápida se siembra alineada con la lenta,
+        # con los 12 cierres que terminan donde la lenta da su primer valor, y la
+        # señal es la EMA de 9 de la diferencia desde ese punto
+        nuevo['recursion_macd_lenta'], lenta = _paso_ema(estado['recursion_macd_lenta'], precio, 26)
+        if estado['velas'] >= 26 - 12:
+            nuevo['recursion_macd_rapida'], rapida = _paso_ema(
+                estado['recursion_macd_rapida'], precio, 12
+            )
+        if not np.isnan(lenta):
+            nuevo['recursion_macd_signal'], macd_signal = _paso_ema(
+                estado['recursion_macd_signal'], rapida - lenta, 9
+            )
+            if not np.isnan(macd_signal):
+                nuevo['macd'] = rapida - lenta
+                nuevo['macd_signal'] = macd_signal
+                nuevo['macd_hist'] = nuevo['macd'] - macd_signal
+        
+        return nuevo
     
-    def confirmar_señal_venta(self, fila):
+    def generar_señales(self, df):
         """
-        Confirma señal de venta con RSI y MACD
+        Genera señales de compra/venta basadas en cruces de EMAs
         """
-        confirmaciones = []
-        if fila['rsi'] > 30:
-            confirmaciones.append("RSI_OK")
-        if fila['macd'] < fila['macd_signal']:
-            confirmaciones.append("MACD_OK")
-        return confirmaciones
+        # Filtrar solo las velas con cruce (en orden cronológico)
+        df_señales = df.loc[df['cruce_alcista'] | df['cruce_bajista']]
+        es_compra = df_señales['cruce_alcista'].to_numpy(dtype=bool)
+        
+        # El campo symbol toma el ancho del símbolo más largo (U usa 4 bytes por carácter)
+        simbolos = df_señales['symbol'].to_numpy(dtype=str)
+        señales = np.zeros(len(df_señales), dtype=dtype_señal(simbolos.dtype.itemsize // 4))
+        señales['tipo'] = np.where(es_compra, 'COMPRA', 'VENTA')
+        señales['symbol'] = simbolos
+        señales['datetime'] = df_señales['datetime'].to_numpy()
+        señales['precio'] = df_señales['close'].to_numpy()
+        for campo in ('ema_rapida', 'ema_lenta', 'vwap', 'precio_vs_vwap', 'rsi', 'macd'):
+            señales[campo] = df_señales[campo].to_numpy()
+        
+        # Confirmaciones con RSI y MACD (precalculadas en calcular_indicadores)
+        señales['rsi_ok'] = np.where(es_compra, df_señales['rsi_buy_ok'], df_señales['rsi_sell_ok'])
+        señales['macd_ok'] = np.where(es_compra, df_señales['macd_bull'], df_señales['macd_bear'])
+        
+        return señales
     
     def calcular_rendimiento(self, df, señales):
         """
@@ -187,35 +556,41 @@ class EstrategiaCrucesEMAs:
         if len(señales) < 2:
             return None
         
-        operaciones = []
-        posicion = None
-        
-        for señal in señales:
-            if señal['tipo'] == 'COMPRA' and posicion is None:
-                posicion = {
-                    'entrada': señal['precio'],
-                    'fecha_entrada': señal['datetime'],
-                    'symbol': señal['symbol']
-                }
-            elif señal['tipo'] == 'VENTA' and posicion is not None and posicion['symbol'] == señal['symbol']:
-                rendimiento = (señal['precio'] - posicion['entrada']) / posicion['entrada'] * 100
-                operaciones.append({
-                    'symbol': señal['symbol'],
-                    'entrada': posicion['entrada'],
-                    'salida': señal['precio'],
-                    'fecha_entrada': posicion['fecha_entrada'],
-                    'fecha_salida': señal['datetime'],
-                    'rendimiento': rendimiento
-                })
-                posicion = None
-        
-        if operaciones:
-            rendimiento_total = sum([op['rendimiento'] for op in operaciones])
-            operaciones_ganadoras = len([op for op in operaciones if op['rendimiento'] > 0])
+        df_señales = pd.DataFrame(señales)
+        tramos = []
+        
+        for symbol, grupo in df_señales.groupby('symbol', sort=False):
+            # Solo cuenta la primera señal de cada racha (compra abre, venta cierra)
+            grupo = grupo[grupo['tipo'] != grupo['tipo'].shift()]
+            
+            # Una venta sin posición abierta se ignora
+            if len(grupo) and grupo['tipo'].iloc[0] == 'VENTA':
+                grupo = grupo.iloc[1:]
+            
+            # Emparejar compras (filas pares) con ventas (filas impares)
+            n = len(grupo) // 2 * 2
+            entradas = grupo.iloc[0:n:2]
+            salidas = grupo.iloc[1:n:2]
+            tramos.append(pd.DataFrame({
+                'symbol': symbol,
+                'entrada': entradas['precio'].to_numpy(dtype=np.float64),
+                'salida': salidas['precio'].to_numpy(dtype=np.float64),
+                'fecha_entrada': entradas['datetime'].to_numpy(),
+                'fecha_salida': salidas['datetime'].to_numpy()
+            }))
+        
+        operaciones = pd.concat(tramos, ignore_index=True)
+        
+        if len(operaciones):
+            operaciones['rendimiento'] = (
+                (operaciones['salida'] - operaciones['entrada']) / operaciones['entrada'] * 100
+            )
+            rendimiento_total = float(operaciones['rendimiento'].sum())
+            operaciones_ganadoras = int((operaciones['rendimiento'] > 0).sum())
             tasa_acierto = operaciones_ganadoras / len(operaciones) * 100
             
             return {
-                'operaciones': operaciones,
+                'operaciones': operaciones.to_dict('records'),
                 'rendimiento_total': rendimiento_total,
                 'num_operaciones': len(operaciones),
                 'tasa_acierto': tasa_acierto,
@@ -226,65 +601,106 @@ class EstrategiaCrucesEMAs:
     
     def ejecutar_estrategia(self):
         """
-        Ejecuta la estrategia para todos los símbolos
+        Ejecuta la estrategia para todos los símbolos (desde código síncrono)
+        """
+        return asyncio.run(self._ejecutar_y_cerrar())
+    
+    async def _ejecutar_y_cerrar(self):
+        """
+        Ejecuta la estrategia y cierra el cliente, que queda ligado a este event loop
+        """
+        try:
+            return await self.ejecutar_estrategia_async()
+        finally:
+            await self.cerrar()
+    
+    async def ejecutar_estrategia_async(self):
+        """
+        Ejecuta la estrategia para todos los símbolos dentro de un event loop
+        
+        El cliente del exchange queda abierto entre llamadas; se cierra con
+        cerrar() o usando la estrategia como `async with`. El CSV se escribe
+        símbolo a símbolo, pero la lista devuelta sigue conteniendo todos los
+        DataFrames con indicadores, así que la memoria crece con el número de
+        símbolos igual que antes.
         """
         all_dataframes = []
         all_señales = []
         all_rendimientos = {}
+        archivo_csv = 'datos_multi_crypto_estrategia.csv'
+        archivo_tmp = archivo_csv + '.tmp'
         
-        for symbol in self.symbols:
-            print(f"\n🚀 Ejecutando estrategia para {symbol}")
-            print(f"📊 Timeframe: {self.timeframe}")
-            print(f"📈 EMA Rápida: {self.ema_rapida}, EMA Lenta: {self.ema_lenta}")
-            print("-" * 50)
-            
-            # Obtener datos
-            df = self.obtener_datos(symbol, limit=200)
-            if df is None:
-                continue
-                
-            # Calcular indicadores
-            df = self.calcular_indicadores(df)
-            
-            # Generar señales
-            señales = self.generar_señales(df)
-            all_señales.extend(señales)
-            
-            # Mostrar últimas señales
-            print(f"🎯 ÚLTIMAS SEÑALES PARA {symbol}:")
-            symbol_señales = [s for s in señales[-5:] if s['symbol'] == symbol]
-            for señal in symbol_señales:
-                print(f"  {señal['tipo']} - {señal['datetime']} - Precio: ${señal['precio']:.4f}")
-                print(f"    EMAs: {señal['ema_rapida']:.4f} / {señal['ema_lenta']:.4f}")
-                print(f"    RSI: {señal['rsi']:.2f} - Confirmaciones: {señal['confirmacion']}")
-                print()
-            
-            # Calcular rendimiento
-            rendimiento = self.calcular_rendimiento(df, señales)
-            if rendimiento:
-                print(f"💰 RENDIMIENTO DE LA ESTRATEGIA PARA {symbol}:")
-                print(f"  Rendimiento Total: {rendimiento['rendimiento_total']:.2f}%")
-                print(f"  Número de Operaciones: {rendimiento['num_operaciones']}")
-                print(f"  Tasa de Acierto: {rendimiento['tasa_acierto']:.2f}%")
-                print(f"  Rendimiento Promedio: {rendimiento['rendimiento_promedio']:.2f}%")
-                all_rendimientos[symbol] = rendimiento
-            
-            # Estado actual
-            ultimo_row = df.iloc[-1]
-            print(f"\n📊 ESTADO ACTUAL PARA {symbol}:")
-            print(f"  Precio: ${ultimo_row['close']:.4f}")
-            print(f"  EMA {self.ema_rapida}: {ultimo_row['ema_rapida']:.4f}")
-            print(f"  EMA {self.ema_lenta}: {ultimo_row['ema_lenta']:.4f}")
-            print(f"  Tendencia: {ultimo_row['tendencia']}")
-            print(f"  RSI: {ultimo_row['rsi']:.2f}")
-            
-            all_dataframes.append(df)
+        # Descargar datos de todos los símbolos en paralelo (solo I/O de red)
+        datos = await self.descargar_datos(limit=200)
+        
+        # Se escribe en un archivo temporal que solo reemplaza al CSV si todo termina
+        # bien; si un símbolo falla, el archivo se cierra y el temporal se borra
+        escritos = 0
+        try:
+            with open(archivo_tmp, 'w', newline='', encoding='utf-8') as csv:
+                for symbol in self.symbols:
+                    print(f"\n🚀 Ejecutando estrategia para {symbol}")
+                    print(f"📊 Timeframe: {self.timeframe}")
+                    print(f"📈 EMA Rápida: {self.ema_rapida}, EMA Lenta: {self.ema_lenta}")
+                    print("-" * 50)
+                    
+                    # Obtener datos
+                    df = datos[symbol]
+                    if df is None:
+                        continue
+                        
+                    # Calcular indicadores
+                    df = self.calcular_indicadores(df)
+                    
+                    # Generar señales
+                    señales = self.generar_señales(df)
+                    all_señales.append(señales)
+                    
+                    # Mostrar últimas señales
+                    print(f"🎯 ÚLTIMAS SEÑALES PARA {symbol}:")
+                    ultimas = señales[-5:]
+                    for señal in map(señal_a_dict, ultimas[ultimas['symbol'] == symbol]):
+                        print(f"  {señal['tipo']} - {señal['datetime']} - Precio: ${señal['precio']:.4f}")
+                        print(f"    EMAs: {señal['ema_rapida']:.4f} / {señal['ema_lenta']:.4f}")
+                        print(f"    RSI: {señal['rsi']:.2f} - Confirmaciones: {señal['confirmacion']}")
+                        print()
+                    
+                    # Calcular rendimiento
+                    rendimiento = self.calcular_rendimiento(df, señales)
+                    if rendimiento:
+                        print(f"💰 RENDIMIENTO DE LA ESTRATEGIA PARA {symbol}:")
+                        print(f"  Rendimiento Total: {rendimiento['rendimiento_total']:.2f}%")
+                        print(f"  Número de Operaciones: {rendimiento['num_operaciones']}")
+                        print(f"  Tasa de Acierto: {rendimiento['tasa_acierto']:.2f}%")
+                        print(f"  Rendimiento Promedio: {rendimiento['rendimiento_promedio']:.2f}%")
+                        all_rendimientos[symbol] = rendimiento
+                    
+                    # Estado actual
+                    ultimo_row = df.iloc[-1]
+                    print(f"\n📊 ESTADO ACTUAL PARA {symbol}:")
+                    print(f"  Precio: ${ultimo_row['close']:.4f}")
+                    print(f"  EMA {self.ema_rapida}: {ultimo_row['ema_rapida']:.4f}")
+                    print(f"  EMA {self.ema_lenta}: {ultimo_row['ema_lenta']:.4f}")
+                    print(f"  Tendencia: {ultimo_row['tendencia']}")
+                    print(f"  RSI: {ultimo_row['rsi']:.2f}")
+                    
+                    all_dataframes.append(df)
+                    
+                    # Escribir cada símbolo al CSV en cuanto termina (sin concatenar todo)
+                    df.to_csv(csv, index=False, header=escritos == 0)
+                    escritos += 1
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(archivo_tmp)
+            raise
+        
+        if escritos:
+            os.replace(archivo_tmp, archivo_csv)
+            print(f"\n💾 Datos guardados en '{archivo_csv}'")
+        else:
+            os.remove(archivo_tmp)
         
-        # Combinar todos los dataframes
-        if all_dataframes:
-            combined_df = pd.concat(all_dataframes)
-            combined_df.to_csv('datos_multi_crypto_estrategia.csv', index=False)
-            print("\n💾 Datos guardados en 'datos_multi_crypto_estrategia.csv'")
+        all_señales = np.concatenate(all_señales) if all_señales else np.zeros(0, dtype=dtype_señal(1))
         
         return all_dataframes, all_señales, all_rendimientos
 